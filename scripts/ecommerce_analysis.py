@@ -28,6 +28,7 @@ get_ipython().system('pip install wordcloud')
 import os
 import json
 import shutil
+from collections import deque
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -37,6 +38,75 @@ from tabulate import tabulate
 from wordcloud import WordCloud
 
 
+# ### **🔹 Money Helpers: Fixed-Point Arithmetic**
+# Prices and sales are held as **integer minor units** (`int64`) from parsing through aggregation, so totals are exact and identical no matter how the rows are partitioned or summed. Values are converted back to currency units only when printing, plotting, or saving.
+#
+# - `UnitPrice` is parsed from its text form, never through a float.
+# - `Quantity * UnitPrice` and every sum are checked for `int64` overflow.
+#
+
+# In[4]:
+
+
+# Number of decimal places kept for money (a few catalogue prices use 3, e.g. 0.001)
+MONEY_DECIMALS = 3
+MONEY_SCALE = 10 ** MONEY_DECIMALS
+INT64_MIN, INT64_MAX = int(np.iinfo(np.int64).min), int(np.iinfo(np.int64).max)
+PRICE_PATTERN = rf'[+-]?(\d+(\.\d{{0,{MONEY_DECIMALS}}})?|\.\d{{1,{MONEY_DECIMALS}}})'
+
+def to_minor_units(prices):
+    """Parse decimal price strings into exact int64 minor units."""
+    text = prices.astype('string').str.strip()
+    invalid = ~text.str.fullmatch(PRICE_PATTERN).fillna(False).astype(bool)
+    if invalid.any():
+        examples = prices[invalid].head(5).to_dict()
+        raise ValueError(f"{invalid.sum()} price(s) are missing, not plain decimals, or have more than "
+                         f"{MONEY_DECIMALS} decimal places (row: value): {examples}")
+    text = text.astype(object)
+    negative = text.str.startswith('-')
+    parts = text.str.lstrip('+-').str.partition('.')
+    whole, fraction = parts[0].str.lstrip('0'), parts[2].str.ljust(MONEY_DECIMALS, '0')
+    # Compare digit strings against the largest representable price, so no conversion can wrap around
+    limit_whole, limit_fraction = str(INT64_MAX // MONEY_SCALE), str(INT64_MAX % MONEY_SCALE).zfill(MONEY_DECIMALS)
+    same_length = whole.str.len() == len(limit_whole)
+    too_large = ((whole.str.len() > len(limit_whole)) | (same_length & (whole > limit_whole))
+                 | ((whole == limit_whole) & (fraction > limit_fraction)))
+    if too_large.any():
+        examples = prices[too_large].head(5).to_dict()
+        raise OverflowError(f"{too_large.sum()} price(s) exceed the int64 range in minor units (row: value): {examples}")
+    minor = whole.replace('', '0').astype(np.int64) * MONEY_SCALE + fraction.astype(np.int64)
+    return minor.where(~negative, -minor)
+
+def checked_multiply(quantity, price_minor):
+    """Multiply two int64 series, raising OverflowError instead of wrapping around."""
+    quantity, price_minor = quantity.astype(np.int64), price_minor.astype(np.int64)
+    limit = INT64_MAX // price_minor.abs().clip(lower=1)
+    if (quantity.abs() > limit).any():
+        raise OverflowError("Quantity * UnitPrice exceeds the int64 range.")
+    return quantity * price_minor
+
+def checked_sum(values, group=lambda s: s):
+    """Sum int64 money, optionally grouped (e.g. lambda s: s.resample('M')), raising OverflowError on overflow."""
+    magnitude = max(abs(int(values.min())), abs(int(values.max()))) if len(values) else 0
+    # Exact bound: no partial sum can leave the int64 range, so the plain int64 sum is safe
+    if len(values) * magnitude <= INT64_MAX:
+        return group(values).sum()
+    # Rare fallback: exact Python-int totals, checked against the int64 range
+    totals = group(values.astype(object)).sum()
+    exact = totals if isinstance(totals, pd.Series) else pd.Series([totals])
+    if exact.map(lambda total: not INT64_MIN <= int(total) <= INT64_MAX).any():
+        raise OverflowError(f"Money total is outside the int64 range [{INT64_MIN}, {INT64_MAX}].")
+    return totals.astype(np.int64) if isinstance(totals, pd.Series) else np.int64(totals)
+
+def to_display_units(minor):
+    """Convert int64 minor units to currency units (output boundary only)."""
+    return minor / MONEY_SCALE
+
+def with_display_units(data, columns=('UnitPrice', 'TotalSales')):
+    """Return a copy of `data` with its money columns in currency units, for printing or saving."""
+    return data.assign(**{col: to_display_units(data[col]) for col in columns if col in data.columns})
+
+
 # ### **🔹 Step 2: Load and Inspect the Raw Data**
 # Let's load the dataset and perform an initial exploration to understand its structure and content..**
 # 
@@ -44,9 +114,10 @@ from wordcloud import WordCloud
 # In[5]:
 
 
-# Load Dataset
+# Load Dataset (UnitPrice is read as text and stored as exact int64 minor units)
 file_path = '../datasets/ecommerce_data.csv'
-raw_data = pd.read_csv(file_path, encoding='ISO-8859-1')
+raw_data = pd.read_csv(file_path, encoding='ISO-8859-1', dtype={'UnitPrice': str})
+raw_data['UnitPrice'] = to_minor_units(raw_data['UnitPrice'])
 
 
 # In[6]:
@@ -57,10 +128,10 @@ print("Raw Data Information:")
 raw_data.info()
 
 print("\nDescriptive Statistics:")
-print(raw_data.describe())
+print(with_display_units(raw_data).describe())
 
 print("\nFirst few rows of raw data:")
-print(raw_data.head())
+print(with_display_units(raw_data.head()))
 
 
 # ### **🔹 Step 3: Explore Data**
@@ -81,7 +152,7 @@ print("Number of unique products:", raw_data['Description'].nunique())
 
 # Summary for numerical columns 'Quantity' and 'UnitPrice'
 print("\nSummary of 'Quantity' and 'UnitPrice':")
-print(raw_data[['Quantity', 'UnitPrice']].describe())
+print(with_display_units(raw_data[['Quantity', 'UnitPrice']]).describe())
 
 
 # #### 📌 Key Findings from the Data Exploration
@@ -120,9 +191,9 @@ print(missing_percentage)
 # Identify rows with missing 'Description'
 missing_description = raw_data[raw_data['Description'].isnull()]
 print("\nRows with missing descriptions:")
-print(missing_description.head())
+print(with_display_units(missing_description.head()))
 print("\nSummary of rows with missing descriptions (for 'Quantity', 'UnitPrice', 'CustomerID'):")
-print(missing_description[['Quantity', 'UnitPrice', 'CustomerID']].describe())
+print(with_display_units(missing_description[['Quantity', 'UnitPrice', 'CustomerID']]).describe())
 
 
 # In[14]:
@@ -132,18 +203,22 @@ print(missing_description[['Quantity', 'UnitPrice', 'CustomerID']].describe())
 print("\nNumber of rows with missing 'CustomerID' among missing descriptions:",
       missing_description['CustomerID'].isnull().sum())
 print("\nDistribution of 'UnitPrice' for missing descriptions:")
-print(missing_description['UnitPrice'].value_counts())
+print(to_display_units(missing_description['UnitPrice']).value_counts())
 
 
 # In[15]:
 
 
-# Flag incomplete rows (missing Description, UnitPrice == 0, or missing CustomerID)
-raw_data['IsIncomplete'] = raw_data['Description'].isnull() | (raw_data['UnitPrice'] == 0.0) | raw_data['CustomerID'].isnull()
+def is_incomplete(data):
+    """Incomplete rows: missing Description, UnitPrice == 0, or missing CustomerID."""
+    return data['Description'].isnull() | (data['UnitPrice'] == 0) | data['CustomerID'].isnull()
+
+# Flag incomplete rows
+raw_data['IsIncomplete'] = is_incomplete(raw_data)
 incomplete_data = raw_data[raw_data['IsIncomplete']]
 print("\nNumber of incomplete rows identified:", len(incomplete_data))
 print("Preview of incomplete rows:")
-print(incomplete_data.head())
+print(with_display_units(incomplete_data.head()))
 
 
 # #### 📌 Key Findings
@@ -165,8 +240,12 @@ print(incomplete_data.head())
 # In[18]:
 
 
+def normalize_description(descriptions):
+    """Lowercase descriptions, replacing missing values with an empty string."""
+    return descriptions.fillna("").str.lower()
+
 # Normalize 'Description' to lowercase (replace missing values with an empty string)
-raw_data['NormalizedDescription'] = raw_data['Description'].fillna("").str.lower()
+raw_data['NormalizedDescription'] = normalize_description(raw_data['Description'])
 
 # Count occurrences of each unique description
 description_counts = raw_data['NormalizedDescription'].value_counts()
@@ -239,24 +318,260 @@ print(longest_descriptions[['Description', 'InvoiceNo', 'StockCode']])
 
 # Identify placeholder descriptions using specific keywords
 placeholder_keywords = 'test|sample|unknown|placeholder|barcode|\?|damage|wrong|wrongly|lost|broken|thrown'
-placeholder_descriptions = raw_data[raw_data['NormalizedDescription'].str.contains(placeholder_keywords, na=False, regex=True)]
-print("\nIdentified Placeholder Descriptions (for further inspection):")
-print(placeholder_descriptions[['InvoiceNo', 'StockCode', 'Description', 'Quantity', 'UnitPrice', 'CustomerID']])
+
+# Cleaning rules, applied in this order; each row is labelled with the first rule that drops it
+DROP_RULES = ['Placeholder', 'ShortDescription', 'Cancelled', 'Duplicate', 'NonPositivePrice']
+QUALITY_COUNTERS = ['Rows', 'Lines', 'Sales', 'Incomplete', 'NegativePrice'] + DROP_RULES
+# Timestamp format of the feed (e.g. '12/1/2010 8:26'); an explicit format avoids slow per-row date inference
+INVOICE_DATE_FORMAT = '%m/%d/%Y %H:%M'
+
+
+class RecentKeys:
+    """(InvoiceNo, StockCode) keys of the last `window` batches, so rows re-delivered in a later batch are dropped."""
+
+    def __init__(self, window=7):
+        self._batches = deque(maxlen=window)
+
+    def contains(self, keys):
+        """Boolean mask of the keys already seen in the window."""
+        seen = np.zeros(len(keys), dtype=bool)
+        for batch_keys in self._batches:
+            seen |= keys.isin(batch_keys)
+        return seen
+
+    def add(self, keys):
+        """Remember the keys of one batch, forgetting the oldest batch once the window is full."""
+        self._batches.append(keys.unique())
+
+
+def clean_batch(batch, recent_keys=None):
+    """Label each row with the cleaning rule that drops it (None if kept) and count quality metrics, in one pass.
+
+    Duplicates are (InvoiceNo, StockCode) keys repeated within the batch or, given `recent_keys`, seen in
+    its window of earlier batches. Returns the labelled batch and its counters per (Weekday, Hour, Country)
+    for `DataQualityMonitor`.
+    """
+    batch = batch.copy()
+    batch['InvoiceDate'] = pd.to_datetime(batch['InvoiceDate'], format=INVOICE_DATE_FORMAT, errors='coerce')
+    batch['IsIncomplete'] = is_incomplete(batch)
+    batch['NormalizedDescription'] = normalize_description(batch['Description'])
+
+    kept = np.ones(len(batch), dtype=bool)
+    hits = {}
+    for rule, dropped in [('Placeholder', batch['NormalizedDescription'].str.contains(placeholder_keywords, regex=True)),
+                          ('ShortDescription', batch['NormalizedDescription'].str.len() <= 3),
+                          ('Cancelled', batch['InvoiceNo'].astype(str).str.startswith('C'))]:
+        hits[rule] = kept & dropped.to_numpy()
+        kept &= ~hits[rule]
+    keys = pd.MultiIndex.from_arrays([batch['InvoiceNo'].astype(str), batch['StockCode'].astype(str)])
+    hits['Duplicate'] = kept & keys.duplicated(keep='first')
+    if recent_keys is not None:
+        hits['Duplicate'] |= kept & recent_keys.contains(keys)
+        recent_keys.add(keys[kept & ~hits['Duplicate']])
+    kept &= ~hits['Duplicate']
+    hits['NonPositivePrice'] = kept & (batch['UnitPrice'].to_numpy() <= 0)
+    kept &= ~hits['NonPositivePrice']
+
+    reason = np.full(len(batch), None, dtype=object)
+    for rule in DROP_RULES:
+        reason[hits[rule]] = rule
+    batch['DropReason'] = reason
+    # Only kept rows are priced, so a junk row with an absurd quantity is labelled rather than fatal
+    total_sales = np.zeros(len(batch), dtype=np.int64)
+    total_sales[kept] = checked_multiply(batch['Quantity'][kept], batch['UnitPrice'][kept]).to_numpy()
+    batch['TotalSales'] = total_sales
+
+    # Sales here only feeds the monitor's float statistics; reported totals always use checked_sum
+    dates = batch['InvoiceDate']
+    counters = pd.DataFrame({
+        'Rows': 1,
+        'Lines': kept,
+        'Sales': total_sales,
+        'Incomplete': batch['IsIncomplete'],
+        'NegativePrice': batch['UnitPrice'] < 0,
+        **{rule: hits[rule] for rule in DROP_RULES},
+    }, index=batch.index).astype(np.float64)
+    counters = counters.groupby([dates.dt.day_name().rename('Weekday'), dates.dt.hour.rename('Hour'),
+                                 batch['Country']]).sum()
+    return batch, counters[QUALITY_COUNTERS]
+
+
+# #### 📌 Single-Pass Ingestion with Data-Quality Monitoring
+# The anomalies found by eye in this notebook include the missing Saturday sales, the zero-sales first week of January, negative unit prices, and bursts of placeholder or incomplete rows. For daily feeds we check them automatically, in the same pass as cleaning:
+#
+# - `clean_batch` labels each row with the rule that drops it (`DropReason`) and counts, per weekday, hour and country: rows, kept lines, sales, incomplete rows, negative prices and the hits of each drop rule.
+# - Duplicates are caught within a batch and, through `RecentKeys`, against the keys of the last 7 batches. A row re-delivered more than 7 batches later is not recognised, which keeps the memory bounded.
+# - `DataQualityMonitor` rolls these counters up per weekday, per (weekday, hour) and per (weekday, country). It keeps **rolling baselines** of sales, line counts, incomplete-flag rate, negative-price rate and the rate of each drop rule.
+# - Every baseline is specific to a weekday, so a day is compared with the same weekday in earlier weeks. Weekly closures (no Saturday trading) are then normal for their own weekday, and do not hide a closure on a usual trading day.
+# - Baselines are exponentially weighted means and variances held in one NumPy array per dimension, so memory stays constant per key. Each batch is scored against the baseline *before* being absorbed. Outliers are clipped when absorbed so they do not mask the next anomaly.
+# - Rates are only scored on keys with enough rows, and against a binomial noise floor, so a single cancelled line in a quiet hour is not an alert.
+#
+# The cleaning steps below are views over this labelled output, so the rules are implemented only once.
+#
+
+# In[22]:
+
+
+class DataQualityMonitor:
+    """Rolling per-key baselines of data-quality metrics, flagging batches that deviate from them."""
+
+    # Fields each dimension is keyed by; all start with the weekday, so baselines never mix weekdays
+    DIMENSIONS = {'Weekday': ['Weekday'], 'Hour': ['Weekday', 'Hour'], 'Country': ['Weekday', 'Country']}
+    METRICS = ['Sales', 'Lines', 'IncompleteRate', 'NegativePriceRate', 'DropRate'] + [f'{rule}Rate' for rule in DROP_RULES]
+
+    def __init__(self, span=8, threshold=4.0, min_periods=3, tolerance=0.05, min_rows=30, min_rate=0.01):
+        # span: effective window of the baselines, in weeks (each key is updated once per week of daily batches);
+        # tolerance: relative noise floor on the baseline;
+        # min_rows, min_rate: rates are only scored on keys with min_rows rows, against a binomial noise floor
+        self.alpha = 2 / (span + 1)
+        self.threshold = threshold
+        self.min_periods = min_periods
+        self.tolerance = tolerance
+        self.min_rows = min_rows
+        self.min_rate = min_rate
+        self._keys = {dim: [] for dim in self.DIMENSIONS}
+        self._weekdays = {dim: [] for dim in self.DIMENSIONS}
+        self._slots = {dim: {} for dim in self.DIMENSIONS}
+        self._state = {dim: np.zeros((3, 0, len(self.METRICS))) for dim in self.DIMENSIONS}  # count, mean, var
+
+    def _register(self, dim, keys):
+        """Map keys to rows of the dimension's state array, adding rows for new keys."""
+        if len(keys) == 0:
+            return np.zeros(0, dtype=int)
+        codes, uniques = pd.factorize(keys)
+        slots = self._slots[dim]
+        for key in uniques:
+            if key not in slots:
+                slots[key] = len(self._keys[dim])
+                self._keys[dim].append(key)
+                self._weekdays[dim].append(key[0] if isinstance(key, tuple) else key)
+        state = self._state[dim]
+        if state.shape[1] < len(self._keys[dim]):
+            growth = np.zeros((3, len(self._keys[dim]) - state.shape[1], len(self.METRICS)))
+            self._state[dim] = np.concatenate([state, growth], axis=1)
+        return np.array([slots[key] for key in uniques], dtype=int)[codes]
+
+    def _observe(self, counters, dim):
+        """Roll the batch counters up to every known key of one dimension and derive its metrics."""
+        keys = counters.index.droplevel([name for name in counters.index.names if name not in self.DIMENSIONS[dim]])
+        slots = self._register(dim, keys)
+        sums = np.zeros((len(self._keys[dim]), len(QUALITY_COUNTERS)))
+        np.add.at(sums, slots, counters.to_numpy())
+
+        rows = sums[:, QUALITY_COUNTERS.index('Rows')]
+        lines = sums[:, QUALITY_COUNTERS.index('Lines')]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = sums[:, [QUALITY_COUNTERS.index(name) for name in ['Incomplete', 'NegativePrice']]] / rows[:, None]
+            drop_rate = (rows - lines) / rows
+            rule_rates = sums[:, [QUALITY_COUNTERS.index(rule) for rule in DROP_RULES]] / rows[:, None]
+        rates = np.column_stack([rates, drop_rate, rule_rates])
+        rates[rows < self.min_rows] = np.nan
+        # Keys with no rows in this batch count as zero sales and zero lines
+        return np.column_stack([sums[:, QUALITY_COUNTERS.index('Sales')], lines, rates]), rows
+
+    def _spread(self, mean, var, rows):
+        """Baseline standard deviation with noise floors: relative, Poisson for line counts, binomial for rates."""
+        std = np.maximum(np.sqrt(var), self.tolerance * np.abs(mean))
+        std[:, 1] = np.maximum(std[:, 1], np.sqrt(np.maximum(mean[:, 1], 1.0)))
+        rate = np.clip(mean[:, 2:], 0.0, 1.0)
+        binomial = np.sqrt(np.maximum(rate, self.min_rate) * (1 - rate) / np.maximum(rows, 1.0)[:, None])
+        std[:, 2:] = np.maximum(std[:, 2:], binomial)
+        return std
+
+    def _score(self, dim, observed, mean, std, count):
+        """Alert records for metrics whose deviation from the baseline exceeds the threshold."""
+        deviation = observed - mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = np.where(std > 0, deviation / std, np.nan)
+        z_scores[deviation == 0] = 0.0
+        z_scores[count < self.min_periods] = np.nan
+        hits = np.nan_to_num(np.abs(z_scores)) > self.threshold
+
+        # Sales are reported in currency units
+        scale = np.ones(len(self.METRICS))
+        scale[self.METRICS.index('Sales')] = 1 / MONEY_SCALE
+        return [(dim, self._keys[dim][key], self.METRICS[metric], observed[key, metric] * scale[metric],
+                 mean[key, metric] * scale[metric], z_scores[key, metric])
+                for key, metric in zip(*np.nonzero(hits))]
+
+    def _absorb(self, dim, observed, mean, var, std, count):
+        """Fold one batch into the exponentially weighted baselines (NaN observations are skipped)."""
+        seen = ~np.isnan(observed)
+        # Clip outliers once warmed up, so a flagged batch does not inflate the baseline it was flagged against
+        limit = np.where((count >= self.min_periods) & (std > 0), self.threshold * std, np.inf)
+        deviation = np.where(seen, np.clip(np.nan_to_num(observed - mean), -limit, limit), 0.0)
+        count = count + seen
+        # Plain running mean while warming up, exponential weighting afterwards
+        alpha = np.where(seen, np.maximum(self.alpha, 1 / np.maximum(count, 1)), 0.0)
+        self._state[dim] = np.stack([count, mean + alpha * deviation, (1 - alpha) * (var + alpha * deviation ** 2)])
+
+    def update(self, counters, days=None):
+        """Score one batch's counters (from `clean_batch`) against the baselines, absorb them, and return any alerts.
+
+        `days` lists the calendar days the batch covers (defaults to the weekdays present in it), so that
+        a trading day with no rows at all is still checked.
+        """
+        weekdays = set(counters.index.get_level_values('Weekday') if days is None else days.day_name())
+        self._register('Weekday', pd.Index(sorted(weekdays)))
+        alerts = []
+        for dim in self.DIMENSIONS:
+            observed, rows = self._observe(counters, dim)
+            # Keys of weekdays outside the batch are neither scored nor absorbed
+            observed[~np.isin(self._weekdays[dim], list(weekdays))] = np.nan
+            count, mean, var = self._state[dim]
+            std = self._spread(mean, var, rows)
+            alerts.extend(self._score(dim, observed, mean, std, count))
+            self._absorb(dim, observed, mean, var, std, count)
+        return pd.DataFrame(alerts, columns=['Dimension', 'Key', 'Metric', 'Value', 'Baseline', 'ZScore'])
+
+
+def ingest_batch(batch, monitor, recent_keys=None, days=None):
+    """Clean one batch and score its quality counters in the same pass; returns the labelled batch and any alerts."""
+    labelled, counters = clean_batch(batch, recent_keys)
+    return labelled, monitor.update(counters, days)
+
+
+# In[23]:
+
+
+# Ingest the raw data as a daily feed (days without any rows are ingested as empty batches)
+feed_days = pd.to_datetime(raw_data['InvoiceDate'], format=INVOICE_DATE_FORMAT, errors='coerce').dt.normalize()
+daily_batches = dict(tuple(raw_data.groupby(feed_days)))
+
+monitor, recent_keys = DataQualityMonitor(), RecentKeys()
+labelled_batches, feed_alerts = [], []
+for day in pd.date_range(feed_days.min(), feed_days.max(), freq='D'):
+    labelled, alerts = ingest_batch(daily_batches.get(day, raw_data.iloc[:0]), monitor, recent_keys,
+                                    days=pd.DatetimeIndex([day]))
+    labelled_batches.append(labelled)
+    feed_alerts.append(alerts.assign(Day=day))
+
+# Rows without a parsable date cannot be placed in a daily batch, so they are cleaned without monitoring
+labelled_batches.append(clean_batch(raw_data[feed_days.isna()], recent_keys)[0])
+labelled_data = pd.concat(labelled_batches).sort_index()
+feed_alerts = pd.concat(feed_alerts, ignore_index=True)
+print(f"\nIngested {len(labelled_data)} rows; {labelled_data['DropReason'].notna().sum()} labelled for removal.")
+print(labelled_data['DropReason'].value_counts())
 
 
 # In[25]:
 
 
+# Identify placeholder descriptions (rule 'Placeholder' in clean_batch)
+placeholder_descriptions = labelled_data[labelled_data['DropReason'] == 'Placeholder']
+print("\nIdentified Placeholder Descriptions (for further inspection):")
+print(with_display_units(placeholder_descriptions[['InvoiceNo', 'StockCode', 'Description', 'Quantity', 'UnitPrice', 'CustomerID']]))
+
 # Remove placeholder descriptions from the dataset
-clean_data = raw_data.drop(placeholder_descriptions.index)
+clean_data = labelled_data.drop(placeholder_descriptions.index)
 print(f"\nRemoved {len(placeholder_descriptions)} placeholder descriptions.")
 
 
 # In[26]:
 
 
-# Identify and remove short descriptions (length <= 3)
-short_descriptions = clean_data[clean_data['NormalizedDescription'].str.len() <= 3]
+# Identify and remove short descriptions (length <= 3; rule 'ShortDescription' in clean_batch)
+short_descriptions = clean_data[clean_data['DropReason'] == 'ShortDescription']
 print("\nShort Descriptions identified for removal:")
 print(short_descriptions[['Description', 'InvoiceNo', 'StockCode']])
 clean_data = clean_data.drop(short_descriptions.index)
@@ -266,10 +581,10 @@ print(f"Removed {len(short_descriptions)} short descriptions.")
 # In[27]:
 
 
-# Identify and remove cancelled transactions (InvoiceNo starting with 'C')
-cancelled_transactions = clean_data[clean_data['InvoiceNo'].str.startswith('C')]
+# Identify and remove cancelled transactions (InvoiceNo starting with 'C'; rule 'Cancelled' in clean_batch)
+cancelled_transactions = clean_data[clean_data['DropReason'] == 'Cancelled']
 print("\nCancelled Transactions identified for removal:")
-print(cancelled_transactions)
+print(with_display_units(cancelled_transactions))
 clean_data = clean_data.drop(cancelled_transactions.index)
 print(f"Removed {len(cancelled_transactions)} cancelled transactions.")
 
@@ -281,7 +596,7 @@ print(f"Removed {len(cancelled_transactions)} cancelled transactions.")
 
 # Save all removed transactions for review
 dropped_transactions = pd.concat([placeholder_descriptions, short_descriptions, cancelled_transactions])
-dropped_transactions.to_csv('../datasets/dropped_transactions.csv', index=False)
+with_display_units(dropped_transactions).to_csv('../datasets/dropped_transactions.csv', index=False)
 print(f"\n{len(dropped_transactions)} transactions saved to 'dropped_transactions.csv' for further analysis.")
 
 
@@ -303,7 +618,7 @@ print(f"\nRemaining transactions after cleanup: {len(clean_data)}")
 # Detect potential duplicate transactions based on key columns
 duplicate_transactions = clean_data.duplicated(subset=['InvoiceNo', 'StockCode', 'Quantity', 'UnitPrice'], keep=False)
 print("\nPotential Duplicate Transactions (may include valid multiple-item orders):")
-print(clean_data[duplicate_transactions])
+print(with_display_units(clean_data[duplicate_transactions]))
 
 
 # Note: This is not exactly the duplicates that we are looking for since customers might ordered several items in one order.
@@ -323,8 +638,8 @@ print(f"Total duplicate (InvoiceNo, StockCode) entries found: {len(true_duplicat
 # In[35]:
 
 
-# Drop duplicates (keeping the first occurrence)
-clean_data = clean_data.drop_duplicates(subset=['InvoiceNo', 'StockCode'], keep='first')
+# Drop duplicates (keeping the first occurrence; rule 'Duplicate' in clean_batch)
+clean_data = clean_data[clean_data['DropReason'] != 'Duplicate']
 print(f"\nRemaining transactions after dropping duplicates: {len(clean_data)}")
 
 
@@ -334,7 +649,7 @@ print(f"\nRemaining transactions after dropping duplicates: {len(clean_data)}")
 # Handle Negative Quantities
 negative_quantity_transactions = clean_data[clean_data['Quantity'] < 0]
 print("\nNegative Quantity Transactions:")
-print(negative_quantity_transactions.head(20))
+print(with_display_units(negative_quantity_transactions.head(20)))
 print(f"Total negative quantity transactions found: {len(negative_quantity_transactions)}")
 
 
@@ -342,17 +657,17 @@ print(f"Total negative quantity transactions found: {len(negative_quantity_trans
 
 
 # Handle Zero Unit Price Transactions
-zero_price_transactions = clean_data[clean_data['UnitPrice'] == 0.0]
+zero_price_transactions = clean_data[clean_data['UnitPrice'] == 0]
 print("\nTransactions with Zero Unit Price:")
-print(zero_price_transactions.head(20))
+print(with_display_units(zero_price_transactions.head(20)))
 print(f"Total transactions with zero unit price found: {len(zero_price_transactions)}")
 
 
 # In[38]:
 
 
-# Remove zero-price transactions from the dataset
-clean_data = clean_data[clean_data['UnitPrice'] > 0]
+# Remove zero- and negative-price transactions (rule 'NonPositivePrice', the last rule in clean_batch)
+clean_data = clean_data[clean_data['DropReason'].isna()].drop(columns='DropReason')
 print(f"\nRemaining transactions after removing zero-price transactions: {len(clean_data)}")
 
 
@@ -368,8 +683,7 @@ print("Unique country names:", clean_data['Country'].unique())
 # In[40]:
 
 
-# Convert 'InvoiceDate' to datetime format and set as index for time-series analysis
-clean_data['InvoiceDate'] = pd.to_datetime(clean_data['InvoiceDate'], errors='coerce')
+# Set 'InvoiceDate' (parsed to datetime by clean_batch) as index for time-series analysis
 clean_data.set_index('InvoiceDate', inplace=True)
 print("\nConverted 'InvoiceDate' to datetime format and set as index.")
 
@@ -381,11 +695,38 @@ print("\nConverted 'InvoiceDate' to datetime format and set as index.")
 cleaned_file_path = "../datasets/cleaned_ecommerce_data.csv"
 
 # Save the cleaned data
-clean_data.to_csv(cleaned_file_path, index=False, encoding="utf-8")
+with_display_units(clean_data).to_csv(cleaned_file_path, index=False, encoding="utf-8")
 
 print(f" Cleaned dataset saved successfully: {cleaned_file_path}")
 
 
+# ### **🔹 Step 5: Data-Quality Alerts**
+#
+# Deviations flagged by `DataQualityMonitor` while the daily feed was ingested in Step 3.
+#
+
+# In[42]:
+
+
+# Summarize the alerts raised during ingestion
+print(f"\n{len(feed_alerts)} data-quality alerts raised over {feed_alerts['Day'].nunique()} days.")
+print("\nAlerts by dimension and metric:")
+print(feed_alerts.groupby(['Dimension', 'Metric']).size().sort_values(ascending=False))
+print("\nWeekday-level alerts (first 20):")
+print(feed_alerts[feed_alerts['Dimension'] == 'Weekday'].head(20))
+
+
+# In[33]:
+
+
+# Every usual trading day without any rows in the year-end closure (Dec 23, 2010 - Jan 3, 2011) must be flagged
+closure = pd.date_range('2010-12-23', '2011-01-03', freq='D')
+empty_days = closure[~closure.isin(list(daily_batches)) & (closure.day_name() != 'Saturday')]
+flagged_days = feed_alerts.loc[(feed_alerts['Dimension'] == 'Weekday') & (feed_alerts['Metric'] == 'Lines'), 'Day']
+missed_days = empty_days.difference(pd.DatetimeIndex(flagged_days))
+assert missed_days.empty, f"Closure days not flagged: {list(missed_days.strftime('%Y-%m-%d'))}"
+print(f"\nAll {len(empty_days)} empty trading days of the year-end closure were flagged.")
+
 # ---
 # 
 # ## 📊 3. Data Analysis & Visualization
@@ -398,16 +739,16 @@ print(f" Cleaned dataset saved successfully: {cleaned_file_path}")
 # In[43]:
 
 
-# Aggregate Total Sales by Country
-clean_data['TotalSales'] = clean_data['Quantity'] * clean_data['UnitPrice']
+# Total Sales per line was computed by clean_batch in exact int64 minor units
+print(with_display_units(clean_data[['Quantity', 'UnitPrice', 'TotalSales']].head()))
 
 
 # In[44]:
 
 
 # Aggregate Total Sales by Country and sort descending
-country_sales = clean_data.groupby('Country')['TotalSales'].sum().reset_index()
-country_sales = country_sales.sort_values(by='TotalSales', ascending=False)
+country_sales = checked_sum(clean_data['TotalSales'], lambda s: s.groupby(clean_data['Country'])).reset_index()
+country_sales = with_display_units(country_sales.sort_values(by='TotalSales', ascending=False))
 print("\nTotal Sales by Country (Top 10):")
 print(country_sales.head(10))
 
@@ -441,7 +782,8 @@ fig_country_sales.show()
 
 # Top 10 Products by Total Sales 
 if 'TotalSales' in clean_data.columns and 'Description' in clean_data.columns:
-    top_products = clean_data.groupby('Description')['TotalSales'].sum().nlargest(10).reset_index()
+    top_products = checked_sum(clean_data['TotalSales'], lambda s: s.groupby(clean_data['Description'])).nlargest(10).reset_index()
+    top_products = with_display_units(top_products)
 
     # Fore Seaborn visualizations
     plt.figure(figsize=(10, 6))
@@ -471,7 +813,7 @@ if 'TotalSales' in clean_data.columns and 'Description' in clean_data.columns:
 
 
 # Yearly Sales Trend using resampling
-yearly_sales = clean_data['TotalSales'].resample('Y').sum().reset_index()
+yearly_sales = with_display_units(checked_sum(clean_data['TotalSales'], lambda s: s.resample('Y')).reset_index())
 print("\nYearly Sales Trend:")
 print(yearly_sales)
 
@@ -486,7 +828,8 @@ print(yearly_sales)
 
 
 # Analyze Monthly Sales Trend
-monthly_sales = clean_data['TotalSales'].resample('M').sum().asfreq('M', fill_value=0).reset_index()
+monthly_sales = checked_sum(clean_data['TotalSales'], lambda s: s.resample('M')).asfreq('M', fill_value=0).reset_index()
+monthly_sales = with_display_units(monthly_sales)
 print("\nMonthly Sales Trend (first few records):")
 print(monthly_sales.head())
 
@@ -517,7 +860,8 @@ fig_monthly_sales.show()
 
 
 # Analyze Weekly Sales Trend
-weekly_sales = clean_data['TotalSales'].resample('W').sum().asfreq('W', fill_value=0).reset_index()
+weekly_sales = checked_sum(clean_data['TotalSales'], lambda s: s.resample('W')).asfreq('W', fill_value=0).reset_index()
+weekly_sales = with_display_units(weekly_sales)
 print("\nWeekly Sales Trend (first few records):")
 print(weekly_sales.head())
 
@@ -541,8 +885,9 @@ fig_weekly_sales.show()
 
 # Sales by Day of the Week
 clean_data['DayOfWeek'] = clean_data.index.day_name()
-daywise_sales = clean_data.groupby('DayOfWeek')['TotalSales'].sum().reindex(
+daywise_sales = checked_sum(clean_data['TotalSales'], lambda s: s.groupby(clean_data['DayOfWeek'])).reindex(
     ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']).reset_index()
+daywise_sales = with_display_units(daywise_sales)
 print("\nSales by Day of the Week:")
 print(daywise_sales)
 
@@ -562,7 +907,7 @@ fig_daywise_sales.show()
 
 # Sales by Hour of the Day
 clean_data['Hour'] = clean_data.index.hour
-hourly_sales = clean_data.groupby('Hour')['TotalSales'].sum().reset_index()
+hourly_sales = with_display_units(checked_sum(clean_data['TotalSales'], lambda s: s.groupby(clean_data['Hour'])).reset_index())
 print("\nSales by Hour:")
 print(hourly_sales)
 
@@ -586,7 +931,7 @@ fig_hourly_sales.show()
 
 # Unit Price Distribution using Seaborn
 plt.figure(figsize=(10, 6))
-sns.boxplot(x=clean_data['UnitPrice'])
+sns.boxplot(x=to_display_units(clean_data['UnitPrice']))
 plt.title('Unit Price Distribution')
 plt.show()
 
@@ -648,7 +993,7 @@ print(f" Notebook '{notebook_name}' successfully converted and saved as '{destin
 clean_data.reset_index(inplace=True)
 
 # Save the cleaned dataset again
-clean_data.to_csv("../datasets/cleaned_ecommerce_data.csv", index=False, encoding="utf-8")
+with_display_units(clean_data).to_csv("../datasets/cleaned_ecommerce_data.csv", index=False, encoding="utf-8")
 
 print("Cleaned dataset saved with 'InvoiceDate' as a column.")
 